@@ -3,23 +3,148 @@ auth.py — Simple session-based auth (no JWT)
 Sessions stored in SQLite for persistence across restarts.
 """
 
+import os
+import threading
+import time
 import uuid
-from datetime import datetime, timedelta
-from database import get_db
+from collections import OrderedDict, deque
+from database import get_db, SESSION_TTL_HOURS
+from passwords import (
+    verify_password, verify_dummy, needs_rehash, hash_password, forget_verified
+)
 
-SESSION_TTL_HOURS = 8  # Sessions expire after 8 hours
+# Concurrent sessions kept per user; oldest dropped first
+MAX_SESSIONS_PER_USER = int(os.environ.get("FD_MAX_SESSIONS_PER_USER", 1))
+# Expired rows of the user removed per login; > 1 so a login always clears
+# more than it adds, while a large backlog is left to the purger
+SESSION_EXPIRED_PER_LOGIN = 20
+
+# Expired rows deleted per transaction, batches per purge run, and run interval
+SESSION_PURGE_BATCH            = int(os.environ.get("FD_SESSION_PURGE_BATCH", 1000))
+SESSION_PURGE_MAX_BATCHES      = int(os.environ.get("FD_SESSION_PURGE_MAX_BATCHES", 50))
+SESSION_PURGE_INTERVAL_SECONDS = float(os.environ.get("FD_SESSION_PURGE_INTERVAL_SECONDS", 300))
+
+LOGIN_MAX_ATTEMPTS   = 5    # Login attempts allowed per user ...
+LOGIN_WINDOW_SECONDS = 60   # ... within this sliding window
+LOGIN_TRACKED_USERS_MAX = 10_000  # Cap on usernames tracked by the limiter
+
+_login_attempts: "OrderedDict[str, deque]" = OrderedDict()
+_login_lock = threading.Lock()
+
+
+class LoginRateLimited(Exception):
+    """Raised when a user exceeds LOGIN_MAX_ATTEMPTS; map to HTTP 429."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Too many login attempts. Retry in {retry_after:.0f}s.")
+        self.retry_after = retry_after
+
+
+def _sweep_login_attempts(now: float):
+    """
+    Forget usernames with no attempt inside the window; if the table is
+    still full, evict the least recently seen. Caller holds _login_lock.
+    """
+    stale = [u for u, a in _login_attempts.items()
+             if not a or now - a[-1] > LOGIN_WINDOW_SECONDS]
+    for username in stale:
+        del _login_attempts[username]
+    # Evict down to 90% so a full table is not re-swept on every attempt
+    while len(_login_attempts) > LOGIN_TRACKED_USERS_MAX * 9 // 10:
+        _login_attempts.popitem(last=False)
+
+
+def _check_login_rate(username: str):
+    """Record a login attempt, raising LoginRateLimited if over the limit."""
+    now = time.monotonic()
+    with _login_lock:
+        attempts = _login_attempts.get(username)
+        if attempts is None:
+            if len(_login_attempts) >= LOGIN_TRACKED_USERS_MAX:
+                _sweep_login_attempts(now)
+            attempts = _login_attempts[username] = deque()
+        else:
+            _login_attempts.move_to_end(username)
+        while attempts and now - attempts[0] > LOGIN_WINDOW_SECONDS:
+            attempts.popleft()
+        if len(attempts) >= LOGIN_MAX_ATTEMPTS:
+            raise LoginRateLimited(LOGIN_WINDOW_SECONDS - (now - attempts[0]))
+        attempts.append(now)
+
+
+def authenticate(username: str, password: str) -> dict | None:
+    """
+    Verify credentials for /auth/login.
+    Returns user dict on success, None on bad credentials.
+    Legacy SHA-256 hashes are upgraded to scrypt transparently.
+
+    Blocks on the KDF pool: call it from a sync route (FastAPI runs those in
+    its threadpool), not directly from an async def handler.
+    """
+    _check_login_rate(username)
+
+    db = get_db()
+    row = db.execute(
+        "SELECT id, username, password_hash, role FROM users WHERE username=?",
+        (username,)
+    ).fetchone()
+    db.close()
+
+    if not row:
+        # Same KDF cost as a wrong password, so timing does not reveal usernames
+        verify_dummy(password)
+        return None
+    if not verify_password(username, password, row["password_hash"]):
+        return None
+
+    if needs_rehash(row["password_hash"]):
+        db = get_db()
+        db.execute(
+            "UPDATE users SET password_hash=? WHERE id=?",
+            (hash_password(password), row["id"])
+        )
+        db.commit()
+        db.close()
+        forget_verified(username)
+
+    with _login_lock:
+        _login_attempts.pop(username, None)
+
+    return {
+        "user_id":  row["id"],
+        "username": row["username"],
+        "role":     row["role"],
+    }
 
 
 def create_session(user_id: int, username: str, role: str) -> str:
     """Create a new session token and persist it to DB."""
     token = str(uuid.uuid4())
     db = get_db()
-    # Clean up old sessions for this user first
-    db.execute("DELETE FROM sessions WHERE username=?", (username,))
     db.execute(
-        "INSERT INTO sessions(token, user_id, username, role) VALUES(?,?,?,?)",
-        (token, user_id, username, role)
+        "INSERT INTO sessions(token, user_id, username, role, expires_at) "
+        "VALUES(?,?,?,?,datetime('now', ?))",
+        (token, user_id, username, role, f"+{SESSION_TTL_HOURS} hours")
     )
+    # Drop up to SESSION_EXPIRED_PER_LOGIN of this user's expired rows, then
+    # live sessions beyond MAX_SESSIONS_PER_USER, oldest first. Both are
+    # bounded range seeks on the (username, expires_at) index, so login cost
+    # does not grow with the table.
+    db.execute("""
+        DELETE FROM sessions WHERE rowid IN (
+            SELECT rowid FROM sessions
+            WHERE username = ? AND expires_at <= datetime('now')
+            LIMIT ?
+        )
+    """, (username, SESSION_EXPIRED_PER_LOGIN))
+    db.execute("""
+        DELETE FROM sessions WHERE rowid IN (
+            SELECT rowid FROM sessions
+            WHERE username = ? AND expires_at > datetime('now')
+            ORDER BY expires_at DESC, rowid DESC
+            LIMIT -1 OFFSET ?
+        )
+    """, (username, MAX_SESSIONS_PER_USER))
     db.commit()
     db.close()
     return token
@@ -33,25 +158,19 @@ def validate_session(token: str) -> dict | None:
     if not token:
         return None
 
+    # Expired rows are left for purge_expired_sessions(); a lookup stays a
+    # single primary-key probe however many old sessions the table holds.
     db = get_db()
     row = db.execute(
-        "SELECT * FROM sessions WHERE token=?", (token,)
+        "SELECT user_id, username, role FROM sessions "
+        "WHERE token=? AND expires_at > datetime('now')",
+        (token,)
     ).fetchone()
     db.close()
 
     if not row:
         return None
 
-    # Check TTL
-    created_at = datetime.fromisoformat(row["created_at"])
-    if datetime.utcnow() - created_at > timedelta(hours=SESSION_TTL_HOURS):
-        # Expired — clean up
-        db = get_db()
-        db.execute("DELETE FROM sessions WHERE token=?", (token,))
-        db.commit()
-        db.close()
-        return None
-
     return {
         "user_id":  row["user_id"],
         "username": row["username"],
@@ -68,6 +187,58 @@ def delete_session(token: str) -> bool:
     return cur.rowcount > 0
 
 
+def purge_expired_sessions(
+    batch_size: int = SESSION_PURGE_BATCH,
+    max_batches: int = SESSION_PURGE_MAX_BATCHES,
+) -> int:
+    """
+    Delete expired sessions in short batched transactions (uses
+    idx_sessions_expires_at), so the purge never holds the write lock for
+    long. Returns the number of rows removed.
+    """
+    removed = 0
+    db = get_db()
+    for _ in range(max_batches):
+        cur = db.execute("""
+            DELETE FROM sessions WHERE rowid IN (
+                SELECT rowid FROM sessions
+                WHERE expires_at <= datetime('now')
+                LIMIT ?
+            )
+        """, (batch_size,))
+        db.commit()
+        removed += cur.rowcount
+        if cur.rowcount < batch_size:
+            break
+    db.close()
+    return removed
+
+
+def start_session_purger(
+    interval_seconds: float = SESSION_PURGE_INTERVAL_SECONDS,
+) -> threading.Event:
+    """
+    Run purge_expired_sessions() every interval_seconds on a daemon thread.
+
+    Nothing starts this automatically: the FastAPI app must call it once per
+    worker process from its startup hook (next to init_db(), e.g. in
+    @app.on_event("startup") or the lifespan handler) and set the returned
+    event on shutdown. Without it, expired rows of users who never log in
+    again stay in the table.
+    """
+    stop = threading.Event()
+
+    def _loop():
+        while not stop.wait(interval_seconds):
+            try:
+                purge_expired_sessions()
+            except Exception as exc:
+                print(f"[AUTH] Session purge failed: {exc}")
+
+    threading.Thread(target=_loop, name="session-purger", daemon=True).start()
+    return stop
+
+
 def get_role(token: str) -> str | None:
     """Quick helper to get just the role from a token."""
     user = validate_session(token)
@@ -0,0 +1,489 @@
+"""
+bench_backend.py — Reproducible load test for the FD backend hot paths
+
+Seeds a synthetic fd_accounts book into a throwaway FD_DB_PATH, then drives a
+weighted mix of operations from a thread pool and prints throughput and
+latency percentiles as JSON. Same --seed, --rows, --workload and --as-of give
+the same data and the same operation sequence, so reports are comparable
+across commits (FD dates are relative to --as-of, never to today's date):
+
+    python bench_backend.py --rows 100000 --output bench_baseline.json
+    python bench_backend.py --rows 100000 --compare bench_baseline.json
+
+Operations (each mirrors what the matching API route does):
+    login             auth.authenticate + auth.create_session   (POST /auth/login)
+    validate_session  auth.validate_session                     (every protected call)
+    create_fd         CreateFDRequest + compute_maturity + INSERT (POST /fd)
+    list_fds          FDFilterParams filters over fd_accounts   (GET /fd)
+    simulate_closure  compute_premature_closure for one FD      (POST /fd/{fd_no}/simulate-closure)
+    receipt           generate_fd_receipt_pdf for one FD        (GET /fd/{fd_no}/receipt)
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+WORKLOADS = {
+    "mixed": {
+        "login": 5, "validate_session": 40, "create_fd": 10,
+        "list_fds": 25, "simulate_closure": 15, "receipt": 5,
+    },
+    "read_heavy": {"validate_session": 50, "list_fds": 40, "simulate_closure": 10},
+    "write_heavy": {"validate_session": 40, "create_fd": 50, "simulate_closure": 10},
+    "auth": {"login": 20, "validate_session": 80},
+}
+
+BENCH_USERS   = 200      # login users; a separate set holds long-lived sessions
+SEED_CHUNK    = 50_000
+LIST_PAGE     = 100      # rows fetched per register page
+BENCH_PASSWORD = "bench-pass-123"
+
+FIRST_NAMES = ["Ramesh", "Priya", "Arjun", "Lakshmi", "Vikram", "Anita", "Suresh",
+               "Meena", "Karthik", "Divya", "Rahul", "Kavya", "Sanjay", "Deepa"]
+LAST_NAMES  = ["Kumar", "Sharma", "Iyer", "Reddy", "Nair", "Patel", "Singh",
+               "Gupta", "Menon", "Rao", "Das", "Joshi"]
+ID_TYPES    = ["Aadhaar", "PAN", "Passport", "Voter ID", "Driving License"]
+TENURES     = [(6, "months"), (12, "months"), (24, "months"), (36, "months"),
+               (1, "years"), (3, "years"), (5, "years")]
+RATES       = [6.5, 7.0, 7.25, 7.5, 8.0]
+STATUSES    = ["Active"] * 7 + ["Closed"] * 2 + ["PrematurelyClosed"]
+DEFAULT_AS_OF = date(2025, 1, 1)  # reference "today" for seeded and queried FD dates
+
+
+def _fd_no(i: int) -> str:
+    return f"FD{i:016d}"
+
+
+def _tenure_years(value: int, unit: str) -> float:
+    return value / 12 if unit == "months" else float(value)
+
+
+def _maturity_date(start: date, value: int, unit: str) -> date:
+    from dateutil.relativedelta import relativedelta
+
+    months = value if unit == "months" else value * 12
+    return start + relativedelta(months=months)
+
+
+# ── Seeding ────────────────────────────────────────────────────────────
+
+def seed(rows: int, rng: random.Random, old_sessions: int = 0,
+         as_of: date = DEFAULT_AS_OF) -> dict:
+    """
+    Create the schema and bulk-load `rows` synthetic FDs plus bench users.
+    FD start dates fall in the ten years before `as_of`. `old_sessions`
+    expired sessions are added to model a long-lived sessions table.
+    """
+    import auth
+    import database
+    from calculations import compute_maturity
+    from passwords import hash_password
+
+    database.init_db()
+    db = database.get_db()
+    # Bulk-load settings only; the benchmark itself runs on default pragmas
+    db.execute("PRAGMA journal_mode = MEMORY")
+    db.execute("PRAGMA synchronous = OFF")
+
+    started = time.perf_counter()
+    for chunk_start in range(1, rows + 1, SEED_CHUNK):
+        batch = []
+        for i in range(chunk_start, min(chunk_start + SEED_CHUNK, rows + 1)):
+            amount = round(rng.uniform(10_000, 5_000_000), 2)
+            rate = rng.choice(RATES)
+            tenure_value, tenure_unit = rng.choice(TENURES)
+            start = as_of - timedelta(days=rng.randint(0, 3650))
+            itype = rng.choice(["compound", "simple"])
+            status = rng.choice(STATUSES)
+            batch.append((
+                _fd_no(i),
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                rng.choice(ID_TYPES),
+                f"{rng.randint(0, 10 ** 12 - 1):012d}",
+                amount, rate, tenure_value, tenure_unit,
+                start.isoformat(),
+                _maturity_date(start, tenure_value, tenure_unit).isoformat(),
+                round(compute_maturity(amount, rate / 100,
+                                       _tenure_years(tenure_value, tenure_unit), itype), 2),
+                itype, status,
+                start.isoformat() if status != "Active" else None,
+                "officer1",
+            ))
+        db.executemany("""
+            INSERT INTO fd_accounts(fd_no, customer_name, id_type, id_number,
+                deposit_amount, interest_rate, tenure_value, tenure_unit,
+                start_date, maturity_date, maturity_amount, interest_type_used,
+                status, closed_at, created_by)
+            VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+        """, batch)
+        db.commit()
+    fd_seconds = time.perf_counter() - started
+
+    password_hash = hash_password(BENCH_PASSWORD)
+    db.executemany(
+        "INSERT INTO users(username,password_hash,role) VALUES(?,?,?)",
+        [(f"bench_login{i}", password_hash, "officer") for i in range(BENCH_USERS)]
+        + [(f"bench_session{i}", password_hash, "officer") for i in range(BENCH_USERS)]
+    )
+    db.commit()
+    users = {r["username"]: r["id"] for r in db.execute("SELECT id, username FROM users")}
+
+    for chunk_start in range(0, old_sessions, SEED_CHUNK):
+        db.executemany("""
+            INSERT INTO sessions(token, user_id, username, role, created_at, expires_at)
+            VALUES(?,?,?,?,datetime('now', ?),datetime('now', ?))
+        """, [
+            (f"expired-{i}", 1, f"bench_login{i % BENCH_USERS}", "officer",
+             f"-{i % 720 + 9} hours", f"-{i % 720 + 1} hours")
+            for i in range(chunk_start, min(chunk_start + SEED_CHUNK, old_sessions))
+        ])
+        db.commit()
+    db.close()
+
+    tokens = [
+        auth.create_session(users[f"bench_session{i}"], f"bench_session{i}", "officer")
+        for i in range(BENCH_USERS)
+    ]
+    return {"fd_seed_seconds": round(fd_seconds, 2), "tokens": tokens}
+
+
+# ── Operations ─────────────────────────────────────────────────────────
+
+def _config(db) -> dict:
+    return {r["key"]: r["value"] for r in db.execute("SELECT key, value FROM system_config")}
+
+
+def _list_fds(db, params, limit: int = LIST_PAGE) -> list:
+    """Register query: same filters the GET /fd route applies from FDFilterParams."""
+    clauses, args = [], []
+    if params.status:
+        clauses.append("status = ?")
+        args.append(params.status)
+    if params.customer_name:
+        clauses.append("customer_name LIKE ?")
+        args.append(f"%{params.customer_name}%")
+    if params.start_date_from:
+        clauses.append("start_date >= ?")
+        args.append(params.start_date_from.isoformat())
+    if params.start_date_to:
+        clauses.append("start_date <= ?")
+        args.append(params.start_date_to.isoformat())
+    if params.maturity_date_from:
+        clauses.append("maturity_date >= ?")
+        args.append(params.maturity_date_from.isoformat())
+    if params.maturity_date_to:
+        clauses.append("maturity_date <= ?")
+        args.append(params.maturity_date_to.isoformat())
+
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return db.execute(
+        f"SELECT * FROM fd_accounts{where} ORDER BY created_at DESC LIMIT ?",
+        (*args, limit)
+    ).fetchall()
+
+
+def build_operations(state: dict) -> dict:
+    """Return {name: fn(rng)} closures over the seeded state."""
+    import auth
+    import database
+    from calculations import compute_maturity, compute_premature_closure
+    from models import CreateFDRequest, FDFilterParams
+
+    rows = state["rows"]
+    tokens = state["tokens"]
+    as_of = state["as_of"]
+    next_fd = [rows]
+    next_fd_lock = threading.Lock()
+
+    def login(rng):
+        username = f"bench_login{rng.randrange(BENCH_USERS)}"
+        user = auth.authenticate(username, BENCH_PASSWORD)
+        if user is None:
+            raise RuntimeError("login failed")
+        auth.create_session(user["user_id"], user["username"], user["role"])
+
+    def validate_session(rng):
+        if auth.validate_session(rng.choice(tokens)) is None:
+            raise RuntimeError("session rejected")
+
+    def create_fd(rng):
+        tenure_value, tenure_unit = rng.choice(TENURES)
+        req = CreateFDRequest(
+            customer_name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            id_type=rng.choice(ID_TYPES),
+            id_number=f"{rng.randint(0, 10 ** 12 - 1):012d}",
+            deposit_amount=round(rng.uniform(10_000, 5_000_000), 2),
+            interest_rate=rng.choice(RATES),
+            tenure_unit=tenure_unit,
+            start_date=as_of,
+            tenure_value=tenure_value,
+        )
+        with next_fd_lock:
+            next_fd[0] += 1
+            fd_no = _fd_no(next_fd[0])
+
+        db = database.get_db()
+        itype = _config(db)["interest_type"]
+        maturity = compute_maturity(
+            req.deposit_amount, req.interest_rate / 100,
+            _tenure_years(req.tenure_value, req.tenure_unit), itype
+        )
+        db.execute("""
+            INSERT INTO fd_accounts(fd_no, customer_name, id_type, id_number,
+                deposit_amount, interest_rate, tenure_value, tenure_unit,
+                start_date, maturity_date, maturity_amount, interest_type_used,
+                created_by)
+            VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?)
+        """, (
+            fd_no, req.customer_name, req.id_type, req.id_number,
+            req.deposit_amount, req.interest_rate, req.tenure_value, req.tenure_unit,
+            req.start_date.isoformat(),
+            _maturity_date(req.start_date, req.tenure_value, req.tenure_unit).isoformat(),
+            round(maturity, 2), itype, "officer1",
+        ))
+        db.commit()
+        db.close()
+
+    def list_fds(rng):
+        filters = {}
+        if rng.random() < 0.5:
+            filters["status"] = rng.choice(["Active", "Closed", "PrematurelyClosed"])
+        if rng.random() < 0.3:
+            filters["customer_name"] = rng.choice(FIRST_NAMES)
+        if rng.random() < 0.3:
+            start = as_of - timedelta(days=rng.randint(30, 3650))
+            filters["start_date_from"] = start
+            filters["start_date_to"] = start + timedelta(days=rng.randint(7, 365))
+        if rng.random() < 0.2:
+            start = as_of + timedelta(days=rng.randint(0, 1825))
+            filters["maturity_date_from"] = start
+            filters["maturity_date_to"] = start + timedelta(days=rng.randint(7, 180))
+        db = database.get_db()
+        _list_fds(db, FDFilterParams(**filters))
+        db.close()
+
+    def _fetch_fd(db, rng):
+        row = db.execute(
+            "SELECT * FROM fd_accounts WHERE fd_no=?", (_fd_no(rng.randint(1, rows)),)
+        ).fetchone()
+        if row is None:
+            raise RuntimeError("fd not found")
+        return row
+
+    def simulate_closure(rng):
+        db = database.get_db()
+        fd = _fetch_fd(db, rng)
+        cfg = _config(db)
+        db.close()
+        start = date.fromisoformat(fd["start_date"])
+        compute_premature_closure(
+            fd["deposit_amount"], fd["interest_rate"] / 100,
+            start, start + timedelta(days=rng.randint(1, 700)),
+            fd["interest_type_used"], float(cfg["penalty_percent"]),
+        )
+
+    def receipt(rng):
+        from receipt import generate_fd_receipt_pdf
+
+        db = database.get_db()
+        fd = dict(_fetch_fd(db, rng))
+        db.close()
+        generate_fd_receipt_pdf(fd)
+
+    return {
+        "login": login,
+        "validate_session": validate_session,
+        "create_fd": create_fd,
+        "list_fds": list_fds,
+        "simulate_closure": simulate_closure,
+        "receipt": receipt,
+    }
+
+
+# ── Runner ─────────────────────────────────────────────────────────────
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _summarise(latencies: list, errors: int, elapsed: float,
+               first_error: str | None = None) -> dict:
+    values = sorted(latencies)
+    return {
+        "count":          len(values),
+        "errors":         errors,
+        "first_error":    first_error,
+        "throughput_per_s": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms":        _ms(sum(values) / len(values)) if values else 0.0,
+        "p50_ms":         _ms(_percentile(values, 50)),
+        "p90_ms":         _ms(_percentile(values, 90)),
+        "p99_ms":         _ms(_percentile(values, 99)),
+        "max_ms":         _ms(values[-1]) if values else 0.0,
+    }
+
+
+def run_workload(operations: dict, weights: dict, requests: int,
+                 concurrency: int, seed_value: int) -> dict:
+    """
+    Run `requests` operations drawn from `weights` across `concurrency` threads.
+    Each worker has its own seeded RNG, so the per-worker sequence is reproducible.
+    """
+    names = list(weights)
+    weight_list = [weights[n] for n in names]
+    per_worker = [requests // concurrency + (1 if i < requests % concurrency else 0)
+                  for i in range(concurrency)]
+
+    def new_stats() -> dict:
+        return {n: {"latencies": [], "errors": 0, "first_error": None} for n in names}
+
+    def worker(idx: int) -> dict:
+        rng = random.Random(seed_value * 1000 + idx)
+        local = new_stats()
+        for _ in range(per_worker[idx]):
+            name = rng.choices(names, weights=weight_list)[0]
+            stats = local[name]
+            start = time.perf_counter()
+            try:
+                operations[name](rng)
+            except Exception as exc:
+                stats["errors"] += 1
+                if stats["first_error"] is None:
+                    stats["first_error"] = repr(exc)
+                continue
+            stats["latencies"].append(time.perf_counter() - start)
+        return local
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    merged = new_stats()
+    for local in results:
+        for n, stats in local.items():
+            merged[n]["latencies"].extend(stats["latencies"])
+            merged[n]["errors"] += stats["errors"]
+            merged[n]["first_error"] = merged[n]["first_error"] or stats["first_error"]
+
+    all_latencies = [v for s in merged.values() for v in s["latencies"]]
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "total": _summarise(all_latencies, sum(s["errors"] for s in merged.values()), elapsed),
+        "ops": {n: _summarise(s["latencies"], s["errors"], elapsed, s["first_error"])
+                for n, s in merged.items()},
+    }
+
+
+def compare(current: dict, baseline: dict) -> dict:
+    """Percent change per op for throughput and p50/p99 against a saved report."""
+    deltas = {}
+    for name, now in current["ops"].items():
+        before = baseline.get("ops", {}).get(name)
+        if not before:
+            continue
+        deltas[name] = {
+            key: round((now[key] - before[key]) / before[key] * 100, 1) if before[key] else None
+            for key in ("throughput_per_s", "p50_ms", "p99_ms")
+        }
+    return deltas
+
+
+def _git_commit() -> str | None:
+    proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                          cwd=HERE, capture_output=True, text=True)
+    return proc.stdout.strip() or None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the FD backend hot paths.")
+    parser.add_argument("--rows", type=int, default=10_000,
+                        help="Synthetic fd_accounts rows to seed (e.g. 10000 to 10000000)")
+    parser.add_argument("--old-sessions", type=int, default=0,
+                        help="Expired sessions to pre-load into the sessions table")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="mixed")
+    parser.add_argument("--requests", type=int, default=5_000, help="Operations to run in total")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=200, help="Unmeasured operations run first")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=DEFAULT_AS_OF,
+                        help="Reference date (YYYY-MM-DD) for seeded and queried FD dates")
+    parser.add_argument("--keep", action="store_true", help="Keep the temp database directory")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Baseline JSON report to diff against")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="fd_bench_")
+    # Must be set before database/receipt are imported (read at import time)
+    os.environ["FD_DB_PATH"] = os.path.join(workdir, "fd_bench.db")
+    os.environ["FD_RECEIPTS_DIR"] = os.path.join(workdir, "receipts")
+    sys.path.insert(0, HERE)
+
+    try:
+        # Progress output (e.g. init_db's "[DB] ..." lines) goes to stderr so
+        # stdout carries only the JSON report and can be redirected to a file
+        with contextlib.redirect_stdout(sys.stderr):
+            rng = random.Random(args.seed)
+            seeded = seed(args.rows, rng, args.old_sessions, args.as_of)
+            operations = build_operations({
+                "rows": args.rows, "tokens": seeded["tokens"], "as_of": args.as_of,
+            })
+            weights = WORKLOADS[args.workload]
+
+            import passwords
+            passwords.warm_up()
+            if "receipt" in weights:
+                import receipt
+                receipt.warm_up()
+            if args.warmup:
+                run_workload(operations, weights, args.warmup, args.concurrency, args.seed + 1)
+
+            result = run_workload(operations, weights, args.requests, args.concurrency,
+                                  args.seed)
+            passwords.shutdown_pool()
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "commit":    _git_commit(),
+        "python":    sys.version.split()[0],
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {
+            "rows": args.rows, "old_sessions": args.old_sessions,
+            "workload": args.workload, "weights": weights,
+            "requests": args.requests, "concurrency": args.concurrency, "seed": args.seed,
+            "as_of": args.as_of.isoformat(),
+        },
+        "fd_seed_seconds": seeded["fd_seed_seconds"],
+        **result,
+    }
+    if args.keep:
+        report["db_path"] = os.environ["FD_DB_PATH"]
+    if args.compare:
+        with open(args.compare) as f:
+            report["delta_pct"] = compare(report, json.load(f))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
@@ -0,0 +1,129 @@
+"""
+bench_startup.py — Import-time report for the backend modules
+
+Runs each module import in a fresh interpreter under `python -X importtime`
+and reports the cumulative cost plus the heaviest transitive imports as JSON.
+Save the output per commit and pass it back with --compare to spot regressions:
+
+    python bench_startup.py --output startup_baseline.json
+    python bench_startup.py --compare startup_baseline.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from functools import lru_cache
+
+MODULES = ["calculations", "models", "database", "passwords", "auth", "receipt", "main"]
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _last_line(text: str) -> str | None:
+    lines = text.strip().splitlines()
+    return lines[-1] if lines else None
+
+
+def _importtime(code: str) -> tuple[subprocess.CompletedProcess, list]:
+    """Run `code` under -X importtime; return the process and (name, self_us, cum_us) rows."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=HERE, capture_output=True, text=True,
+    )
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return proc, entries
+
+
+@lru_cache(maxsize=1)
+def _interpreter_modules() -> frozenset:
+    """Modules a bare `python -c pass` already imports (site, encodings, ...)."""
+    _, entries = _importtime("pass")
+    return frozenset(name for name, _, _ in entries)
+
+
+def measure_import(module: str, top: int = 5) -> dict:
+    """Import `module` in a clean interpreter and parse its -X importtime trace."""
+    proc, entries = _importtime(f"import {module}")
+    baseline = _interpreter_modules()
+    own_entries = [e for e in entries if e[0] not in baseline]
+
+    own = next((e for e in entries if e[0] == module), None)
+    heaviest = sorted(own_entries, key=lambda e: e[1], reverse=True)[:top]
+    return {
+        "ok":            proc.returncode == 0,
+        "error":         _last_line(proc.stderr) if proc.returncode else None,
+        "cumulative_ms": round(own[2] / 1000, 2) if own else None,
+        "modules_loaded": len(own_entries),
+        "heaviest_self_ms": {name: round(s / 1000, 2) for name, s, _ in heaviest},
+    }
+
+
+def measure_warm_up(module: str) -> dict:
+    """
+    Time `module.warm_up()` in a clean interpreter. Returns warm_up_ms, or
+    warm_up_error when the module has no warm_up() or it raised.
+    """
+    code = (
+        "import time, {m}\n"
+        "if not hasattr({m}, 'warm_up'):\n"
+        "    print('missing')\n"
+        "else:\n"
+        "    t = time.perf_counter(); {m}.warm_up()\n"
+        "    print((time.perf_counter() - t) * 1000)\n"
+    ).format(m=module)
+    proc = subprocess.run([sys.executable, "-c", code], cwd=HERE,
+                          capture_output=True, text=True)
+    out = proc.stdout.strip()
+    if proc.returncode != 0:
+        return {"warm_up_ms": None, "warm_up_error": _last_line(proc.stderr)}
+    if out == "missing":
+        return {"warm_up_ms": None, "warm_up_error": "module has no warm_up()"}
+    return {"warm_up_ms": round(float(out), 2), "warm_up_error": None}
+
+
+def compare(current: dict, baseline: dict) -> dict:
+    """Per-module delta (ms) of cumulative import time against a saved report."""
+    deltas = {}
+    for module, result in current["modules"].items():
+        before = baseline.get("modules", {}).get(module, {}).get("cumulative_ms")
+        now = result["cumulative_ms"]
+        if before is not None and now is not None:
+            deltas[module] = round(now - before, 2)
+    return deltas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report import/startup cost per module.")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--warm-up", action="store_true", help="Also time each module's warm_up()")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Baseline JSON report to diff against")
+    args = parser.parse_args()
+
+    report = {
+        "python":    sys.version.split()[0],
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "modules":   {},
+    }
+    for module in args.modules:
+        result = measure_import(module)
+        if args.warm_up and result["ok"]:
+            result.update(measure_warm_up(module))
+        report["modules"][module] = result
+
+    if args.compare:
+        with open(args.compare) as f:
+            report["delta_ms"] = compare(report, json.load(f))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
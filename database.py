@@ -3,11 +3,25 @@ database.py — SQLite setup and connection helper
 """
 
 import sqlite3
-import hashlib
 import os
 
+from passwords import hash_password
+
 DB_PATH = os.environ.get("FD_DB_PATH", "fd_system.db")
 
+SESSION_TTL_HOURS = 8  # Sessions expire after 8 hours
+
+SESSIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        token      TEXT PRIMARY KEY,
+        user_id    INTEGER NOT NULL,
+        username   TEXT NOT NULL,
+        role       TEXT NOT NULL,
+        created_at TEXT DEFAULT (datetime('now')),
+        expires_at TEXT NOT NULL
+    )
+"""
+
 
 def get_db() -> sqlite3.Connection:
     conn = sqlite3.connect(DB_PATH)
@@ -32,15 +46,24 @@ def init_db():
     """)
 
     # ── Sessions (in-memory key-value via DB for simplicity) ──────────
-    db.execute("""
-        CREATE TABLE IF NOT EXISTS sessions (
-            token      TEXT PRIMARY KEY,
-            user_id    INTEGER NOT NULL,
-            username   TEXT NOT NULL,
-            role       TEXT NOT NULL,
-            created_at TEXT DEFAULT (datetime('now'))
-        )
-    """)
+    db.execute(SESSIONS_DDL.format(table="sessions"))
+    # Databases created before expires_at existed: rebuild the table so it
+    # gets the same NOT NULL column as a fresh one, backfilling from created_at
+    session_cols = {r["name"] for r in db.execute("PRAGMA table_info(sessions)")}
+    if "expires_at" not in session_cols:
+        db.execute(SESSIONS_DDL.format(table="sessions_new"))
+        db.execute("""
+            INSERT INTO sessions_new(token, user_id, username, role, created_at, expires_at)
+            SELECT token, user_id, username, role, created_at,
+                   datetime(COALESCE(created_at, datetime('now')), ?)
+            FROM sessions
+        """, (f"+{SESSION_TTL_HOURS} hours",))
+        db.execute("DROP TABLE sessions")
+        db.execute("ALTER TABLE sessions_new RENAME TO sessions")
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sessions_username ON sessions(username, expires_at)"
+    )
+    db.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at)")
 
     # ── System Config ─────────────────────────────────────────────────
     db.execute("""
@@ -80,8 +103,8 @@ def init_db():
     existing = db.execute("SELECT COUNT(*) as c FROM users").fetchone()["c"]
     if existing == 0:
         users = [
-            ("admin",    hashlib.sha256(b"admin123").hexdigest(),   "supervisor"),
-            ("officer1", hashlib.sha256(b"officer123").hexdigest(), "officer"),
+            ("admin",    hash_password("admin123", in_process=True),   "supervisor"),
+            ("officer1", hash_password("officer123", in_process=True), "officer"),
         ]
         db.executemany(
             "INSERT OR IGNORE INTO users(username,password_hash,role) VALUES(?,?,?)", users
@@ -1,10 +1,10 @@
 import os
 import operator
+from functools import lru_cache
 from typing import Annotated, List, TypedDict, Literal
 
-from langchain_groq import ChatGroq
-from langgraph.graph import StateGraph, END, START
-from langgraph.checkpoint.memory import MemorySaver
+# langchain_groq / langgraph are imported inside the factories below so that
+# importing this module stays cheap; they load on first use (or warm_up()).
 
 
 # 1. Define the Shared State
@@ -15,12 +15,16 @@ class AgentState(TypedDict):
     final_output: str
 
 
-# 2. Initialize Groq LLM
-llm = ChatGroq(
-    temperature=0,
-    model_name="llama-3.3-70b-versatile",
-    groq_api_key=""# ✅ safer (set env variable)
-)
+# 2. Groq LLM (created on first use)
+@lru_cache(maxsize=None)
+def get_llm():
+    from langchain_groq import ChatGroq
+
+    return ChatGroq(
+        temperature=0,
+        model_name="llama-3.3-70b-versatile",
+        groq_api_key=""# ✅ safer (set env variable)
+    )
 
 
 # --- Nodes ---
@@ -29,23 +33,23 @@ def distributor(state: AgentState):
 
 
 def worker_tech(state: AgentState):
-    res = llm.invoke(f"Provide a technical analysis of: {state['input']}")
+    res = get_llm().invoke(f"Provide a technical analysis of: {state['input']}")
     return {"agent_outputs": [f"TECH: {res.content}"]}
 
 
 def worker_market(state: AgentState):
-    res = llm.invoke(f"Provide a market impact analysis of: {state['input']}")
+    res = get_llm().invoke(f"Provide a market impact analysis of: {state['input']}")
     return {"agent_outputs": [f"MARKET: {res.content}"]}
 
 
 def worker_risk(state: AgentState):
-    res = llm.invoke(f"Provide a risk assessment of: {state['input']}")
+    res = get_llm().invoke(f"Provide a risk assessment of: {state['input']}")
     return {"agent_outputs": [f"RISK: {res.content}"]}
 
 
 def evaluator(state: AgentState):
     combined = "\n".join(state["agent_outputs"])
-    res = llm.invoke(
+    res = get_llm().invoke(
         f"On a scale of 1-10, how complete is this report? Return ONLY the number:\n{combined}"
     )
     try:
@@ -57,42 +61,82 @@ def evaluator(state: AgentState):
 
 def refiner(state: AgentState):
     combined = "\n".join(state["agent_outputs"])
-    res = llm.invoke(
+    res = get_llm().invoke(
         f"Summarize and refine these 3 perspectives into a professional executive report:\n{combined}"
     )
     return {"final_output": res.content}
 
 
+# "__end__" is langgraph's END constant, spelled out so the hint needs no import
+def route_after_evaluation(state: AgentState) -> Literal["refiner", "__end__"]:
+    return "refiner" if state["evaluation_score"] >= 7 else "__end__"
+
+
 # 3. Build Graph
-workflow = StateGraph(AgentState)
+def build_workflow():
+    from langgraph.graph import StateGraph, END, START
+
+    workflow = StateGraph(AgentState)
+
+    workflow.add_node("distributor", distributor)
+    workflow.add_node("worker_tech", worker_tech)
+    workflow.add_node("worker_market", worker_market)
+    workflow.add_node("worker_risk", worker_risk)
+    workflow.add_node("evaluator", evaluator)
+    workflow.add_node("refiner", refiner)
+
+    workflow.add_edge(START, "distributor")
+    workflow.add_edge("distributor", "worker_tech")
+    workflow.add_edge("distributor", "worker_market")
+    workflow.add_edge("distributor", "worker_risk")
+
+    workflow.add_edge("worker_tech", "evaluator")
+    workflow.add_edge("worker_market", "evaluator")
+    workflow.add_edge("worker_risk", "evaluator")
+
+    workflow.add_conditional_edges("evaluator", route_after_evaluation)
+    workflow.add_edge("refiner", END)
+    return workflow
+
+
+@lru_cache(maxsize=None)
+def get_workflow():
+    return build_workflow()
+
+
+# 4. Compile with Memory (once, on first use)
+@lru_cache(maxsize=None)
+def get_memory():
+    from langgraph.checkpoint.memory import MemorySaver
+
+    return MemorySaver()
 
-workflow.add_node("distributor", distributor)
-workflow.add_node("worker_tech", worker_tech)
-workflow.add_node("worker_market", worker_market)
-workflow.add_node("worker_risk", worker_risk)
-workflow.add_node("evaluator", evaluator)
-workflow.add_node("refiner", refiner)
 
-workflow.add_edge(START, "distributor")
-workflow.add_edge("distributor", "worker_tech")
-workflow.add_edge("distributor", "worker_market")
-workflow.add_edge("distributor", "worker_risk")
+@lru_cache(maxsize=None)
+def get_app():
+    return get_workflow().compile(checkpointer=get_memory())
 
-workflow.add_edge("worker_tech", "evaluator")
-workflow.add_edge("worker_market", "evaluator")
-workflow.add_edge("worker_risk", "evaluator")
 
+def warm_up():
+    """Load the LLM client and compile the graph ahead of the first request."""
+    get_llm()
+    get_app()
 
-def route_after_evaluation(state: AgentState) -> Literal["refiner", END]:
-    return "refiner" if state["evaluation_score"] >= 7 else END
 
+_LAZY_ATTRS = {
+    "llm":      get_llm,
+    "workflow": get_workflow,
+    "memory":   get_memory,
+    "app":      get_app,
+}
 
-workflow.add_conditional_edges("evaluator", route_after_evaluation)
-workflow.add_edge("refiner", END)
 
-# 4. Compile with Memory
-memory = MemorySaver()
-app = workflow.compile(checkpointer=memory)
+def __getattr__(name):
+    # Former module-level objects (llm, workflow, memory, app) still resolve,
+    # built on first access and shared with the factories above
+    if name in _LAZY_ATTRS:
+        return _LAZY_ATTRS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # 5. CMD Chatbot Loop
@@ -111,7 +155,7 @@ if __name__ == "__main__":
             break
 
         inputs = {"input": user_input}
-        result = app.invoke(inputs, config)
+        result = get_app().invoke(inputs, config)
 
         final_output = result.get("final_output", None)
 
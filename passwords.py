@@ -0,0 +1,237 @@
+"""
+passwords.py — Password hashing (scrypt) with legacy SHA-256 migration
+
+Stored format:  scrypt$<n>$<r>$<p>$<salt_hex>$<hash_hex>
+Legacy format:  64-char hex SHA-256 digest (rehashed on next successful login)
+
+KDF work runs in a small process pool so a burst of logins does not hold
+the GIL; callers block while waiting on it, so use these from sync routes
+(FastAPI runs those in its threadpool), not from async def handlers.
+Successful verifications are cached (keyed by an HMAC of the password, never
+the password itself) so repeat logins skip the KDF.
+
+Pool workers use forkserver/spawn, which re-import the entry script: a script
+that logs users in at module level must do so under `if __name__ == "__main__"`.
+"""
+
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+SCRYPT_N = int(os.environ.get("FD_SCRYPT_N", 2 ** 14))
+SCRYPT_R = int(os.environ.get("FD_SCRYPT_R", 8))
+SCRYPT_P = int(os.environ.get("FD_SCRYPT_P", 1))
+SALT_BYTES = 16
+DKLEN = 32
+
+KDF_WORKERS = int(os.environ.get("FD_KDF_WORKERS", 2))
+VERIFY_CACHE_SIZE = 1024
+VERIFY_CACHE_TTL_SECONDS = 15 * 60
+
+_executor = None  # ProcessPoolExecutor, started on first KDF call
+_executor_lock = threading.Lock()
+
+# Per-process key so cached digests are useless outside this process
+_cache_key = secrets.token_bytes(32)
+_verified: "OrderedDict[str, tuple[str, bytes, float]]" = OrderedDict()
+_verified_lock = threading.Lock()
+
+
+# ── Hashing primitives (run inside pool workers) ───────────────────────
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r * p + 2 ** 20, dklen=DKLEN,
+    )
+
+
+def _hash(password: str, n: int, r: int, p: int) -> str:
+    salt = secrets.token_bytes(SALT_BYTES)
+    digest = _scrypt(password, salt, n, r, p)
+    return f"scrypt${n}${r}${p}${salt.hex()}${digest.hex()}"
+
+
+def _verify(password: str, stored: str) -> bool:
+    try:
+        _, n, r, p, salt_hex, hash_hex = stored.split("$")
+        digest = _scrypt(password, bytes.fromhex(salt_hex), int(n), int(r), int(p))
+    except ValueError:
+        return False
+    return hmac.compare_digest(digest.hex(), hash_hex)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Imported here: multiprocessing is costly to import at startup
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # Not fork: the pool may be first started from a request thread,
+            # and forking a multi-threaded process can deadlock the child.
+            # forkserver is unavailable on Windows, so fall back to spawn.
+            method = ("forkserver" if "forkserver" in multiprocessing.get_all_start_methods()
+                      else "spawn")
+            _executor = ProcessPoolExecutor(
+                max_workers=KDF_WORKERS,
+                mp_context=multiprocessing.get_context(method),
+            )
+        return _executor
+
+
+def warm_up():
+    """Start the KDF worker processes and build the dummy hash ahead of the first login."""
+    _dummy_hash()
+
+
+def shutdown_pool():
+    """Stop the KDF worker processes (call on application shutdown)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+# ── Public API ─────────────────────────────────────────────────────────
+
+def is_legacy_hash(stored: str) -> bool:
+    """True for the old unsalted SHA-256 hex digests."""
+    return len(stored) == 64 and not stored.startswith("scrypt$")
+
+
+def needs_rehash(stored: str) -> bool:
+    """True if the stored hash is legacy or uses weaker-than-current parameters."""
+    if is_legacy_hash(stored):
+        return True
+    try:
+        _, n, r, p, _, _ = stored.split("$")
+    except ValueError:
+        return True
+    return (int(n), int(r), int(p)) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+
+def hash_password(password: str, in_process: bool = False) -> str:
+    """
+    Hash a password with the current scrypt parameters.
+    in_process=True skips the worker pool; use it for one-off work such as
+    seeding in init_db(), which may run before the app is fully imported.
+    """
+    if in_process:
+        return _hash(password, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return _get_executor().submit(_hash, password, SCRYPT_N, SCRYPT_R, SCRYPT_P).result()
+
+
+def _cache_tag(password: str) -> bytes:
+    return hmac.new(_cache_key, password.encode(), hashlib.sha256).digest()
+
+
+def _is_cached(username: str, stored: str, tag: bytes) -> bool:
+    with _verified_lock:
+        entry = _verified.get(username)
+        if entry and entry[0] == stored and entry[2] > time.monotonic():
+            if hmac.compare_digest(entry[1], tag):
+                _verified.move_to_end(username)
+                return True
+    return False
+
+
+def _remember(username: str, stored: str, tag: bytes):
+    with _verified_lock:
+        _verified[username] = (stored, tag, time.monotonic() + VERIFY_CACHE_TTL_SECONDS)
+        _verified.move_to_end(username)
+        while len(_verified) > VERIFY_CACHE_SIZE:
+            _verified.popitem(last=False)
+
+
+def _verify_legacy(password: str, stored: str) -> bool:
+    candidate = hashlib.sha256(password.encode()).hexdigest()
+    return hmac.compare_digest(candidate, stored)
+
+
+def verify_password(username: str, password: str, stored: str) -> bool:
+    """
+    Check a password against its stored hash (blocks the caller on the KDF).
+    Recently verified credentials are answered from cache without the KDF;
+    the cache entry is tied to the stored hash, so a password change
+    invalidates it automatically.
+    """
+    tag = _cache_tag(password)
+    if _is_cached(username, stored, tag):
+        return True
+
+    if is_legacy_hash(stored):
+        ok = _verify_legacy(password, stored)
+        if not ok:
+            # Pad to one KDF call so a failed legacy check costs the same as
+            # a failed scrypt check or an unknown username
+            verify_dummy(password)
+    else:
+        ok = _get_executor().submit(_verify, password, stored).result()
+    if ok:
+        _remember(username, stored, tag)
+    return ok
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    return hash_password(secrets.token_hex(16))
+
+
+def verify_dummy(password: str) -> bool:
+    """
+    Spend the same KDF time as a real check and return False. Used for
+    unknown usernames so response time does not reveal which users exist.
+    """
+    _get_executor().submit(_verify, password, _dummy_hash()).result()
+    return False
+
+
+def forget_verified(username: str):
+    """Drop any cached verification for a user (e.g. on password change)."""
+    with _verified_lock:
+        _verified.pop(username, None)
+
+
+# ── Parameter tuning ───────────────────────────────────────────────────
+
+def benchmark(target_ms: float = 100.0, r: int = SCRYPT_R, p: int = SCRYPT_P) -> dict:
+    """
+    Find the largest scrypt N (power of two) whose hash time stays within
+    target_ms on this machine. Returns the timings for each N tried.
+    """
+    salt = secrets.token_bytes(SALT_BYTES)
+    timings = {}
+    best = 2 ** 10
+    n = 2 ** 10
+    while n <= 2 ** 20:
+        start = time.perf_counter()
+        _scrypt("benchmark-password", salt, n, r, p)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        timings[n] = round(elapsed_ms, 2)
+        if elapsed_ms > target_ms:
+            break
+        best = n
+        n *= 2
+    return {"n": best, "r": r, "p": p, "target_ms": target_ms, "timings_ms": timings}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tune scrypt parameters for this host.")
+    parser.add_argument("--target-ms", type=float, default=100.0,
+                        help="Target time per password hash in milliseconds")
+    args = parser.parse_args()
+
+    result = benchmark(args.target_ms)
+    for n, ms in result["timings_ms"].items():
+        print(f"  N=2^{n.bit_length() - 1:<3} {ms:>9.2f} ms")
+    print(f"\nRecommended: FD_SCRYPT_N={result['n']} "
+          f"FD_SCRYPT_R={result['r']} FD_SCRYPT_P={result['p']}")
@@ -5,40 +5,23 @@ receipt.py — FD receipt PDF generator using ReportLab
 import os
 import tempfile
 from datetime import datetime
+from functools import lru_cache
 
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import mm
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable
-)
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-
+# ReportLab is imported inside the functions below: it is only needed when a
+# receipt is actually generated, so importing this module stays cheap.
 
 RECEIPTS_DIR = os.environ.get("FD_RECEIPTS_DIR", "/tmp/fd_receipts")
-os.makedirs(RECEIPTS_DIR, exist_ok=True)
-
 
-def generate_fd_receipt_pdf(fd: dict) -> str:
-    """
-    Generate a professional A4 PDF receipt for an FD account.
-    Returns the file path.
-    """
-    pdf_path = os.path.join(RECEIPTS_DIR, f"FD_Receipt_{fd['fd_no']}.pdf")
 
-    doc = SimpleDocTemplate(
-        pdf_path,
-        pagesize=A4,
-        leftMargin=20 * mm,
-        rightMargin=20 * mm,
-        topMargin=20 * mm,
-        bottomMargin=20 * mm,
-    )
+@lru_cache(maxsize=1)
+def _receipt_styles() -> dict:
+    """Build the receipt paragraph styles once; reused for every receipt."""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
 
     styles = getSampleStyleSheet()
 
-    # Custom styles
     title_style = ParagraphStyle(
         "BankTitle",
         parent=styles["Title"],
@@ -90,6 +73,55 @@ def generate_fd_receipt_pdf(fd: dict) -> str:
         alignment=TA_CENTER,
     )
 
+    return {
+        "title":          title_style,
+        "subtitle":       subtitle_style,
+        "receipt_label":  receipt_label_style,
+        "section_header": section_header_style,
+        "footer":         footer_style,
+        "note":           note_style,
+    }
+
+
+def warm_up():
+    """Import ReportLab and build styles ahead of the first receipt request."""
+    import reportlab.platypus  # noqa: F401
+    _receipt_styles()
+    os.makedirs(RECEIPTS_DIR, exist_ok=True)
+
+
+def generate_fd_receipt_pdf(fd: dict) -> str:
+    """
+    Generate a professional A4 PDF receipt for an FD account.
+    Returns the file path.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.lib import colors
+    from reportlab.platypus import (
+        SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable
+    )
+
+    os.makedirs(RECEIPTS_DIR, exist_ok=True)
+    pdf_path = os.path.join(RECEIPTS_DIR, f"FD_Receipt_{fd['fd_no']}.pdf")
+
+    doc = SimpleDocTemplate(
+        pdf_path,
+        pagesize=A4,
+        leftMargin=20 * mm,
+        rightMargin=20 * mm,
+        topMargin=20 * mm,
+        bottomMargin=20 * mm,
+    )
+
+    styles = _receipt_styles()
+    title_style          = styles["title"]
+    subtitle_style       = styles["subtitle"]
+    receipt_label_style  = styles["receipt_label"]
+    section_header_style = styles["section_header"]
+    footer_style         = styles["footer"]
+    note_style           = styles["note"]
+
     story = []
 
     # ── Bank Header ────────────────────────────────────────────────────